@@ -1,11 +1,12 @@
+import functools
 import logging
-from datetime import date, datetime, timedelta
+import time
+from datetime import date, datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
-logger = logging.getLogger(__name__)
-
+import orjson
 import requests
-from cachetools import TTLCache, cachedmethod
+from requests.adapters import HTTPAdapter
 
 from helenservice.api_exceptions import InvalidApiResponseException, InvalidDeliverySiteException
 
@@ -15,25 +16,67 @@ from .api_response import (
 )
 from .const import HTTP_READ_TIMEOUT, RESOLUTION_HOUR
 from .helen_session import HelenSession
+from .utils import calculate_usage_impact
+
+logger = logging.getLogger(__name__)
+
+_HELSINKI_TZ = ZoneInfo("Europe/Helsinki")
+_CACHE_MAXSIZE = 128
+
+
+def _memo(ttl: float):
+    """Cache the results of a HelenApiClient method in the instance's _cache for ttl seconds.
+
+    Entries are keyed by the method name and its arguments, so methods sharing the cache never collide.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            entry = self._cache.pop(key, None)
+            if entry is not None and entry[0] > now:
+                self._cache[key] = entry
+                return entry[1]
+            value = func(self, *args, **kwargs)
+            if len(self._cache) >= _CACHE_MAXSIZE:
+                for expired_key in [k for k, (expires_at, _) in self._cache.items() if expires_at <= now]:
+                    del self._cache[expired_key]
+                if len(self._cache) >= _CACHE_MAXSIZE:
+                    # Evict the least recently used entry
+                    del self._cache[next(iter(self._cache))]
+            self._cache[key] = (now + ttl, value)
+            return value
+
+        return wrapper
+
+    return decorator
 
 
 # TODO: consider moving all calculation functions somewhere else - they are not related to HelenApiClient
 class HelenApiClient:
-    HELEN_API_URL_V28 = "https://api.oma.helen.fi/v28"
+    HELEN_API_HOST = "https://api.oma.helen.fi"
+    HELEN_API_URL_V28 = HELEN_API_HOST + "/v28"
     SPOT_PRICES_CHART_ENDPOINT = "/chart-data/electricity/spot-prices/daily"
     CONTRACT_ENDPOINT = "/contract/list"
+    SPOT_PRICES_CHART_URL = HELEN_API_URL_V28 + SPOT_PRICES_CHART_ENDPOINT
+    CONTRACT_URL = HELEN_API_URL_V28 + CONTRACT_ENDPOINT
 
     _session: HelenSession = None
+    _http: requests.Session = None
+    _request_headers: tuple[str, dict] = None
     _saved_cookies: list = None
     _margin: float = None
     _selected_delivery_site_id: str = None
     _selected_contract = None
     _all_active_contracts = None
+    _resolved_contracts = None
 
     def __init__(self, tax: float = None, margin: float = None):
         self._tax = 0.255 if tax is None else tax
         self._margin = 0.38 if margin is None else margin
-        self._cache = TTLCache(maxsize=128, ttl=3600)
+        self._cache: dict = {}
 
     def login_and_init(self, username, password):
         """Login to Oma Helen. Tries cookie-based session renewal first, falls back to full login."""
@@ -59,18 +102,21 @@ class HelenApiClient:
             self._saved_cookies = self._session.get_all_cookies()
             self._session.close()
             self._session = None
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+        self._resolved_contracts = None
 
     def _get_hourly_consumption_costs(self, start_date: date, end_date: date) -> list:
         series = self.get_measurements_with_spot_prices(start_date, end_date, RESOLUTION_HOUR).series
         if not series:
             return []
-        hourly_consumption_costs = []
-        for entry in series:
-            if entry.electricity is None or entry.electricity_spot_prices is None:
-                continue
-            hourly_price_with_tax_and_margin = entry.electricity_spot_prices * (1 + self._tax) + self._margin
-            hourly_consumption_costs.append(abs(hourly_price_with_tax_and_margin * entry.electricity))
-        return hourly_consumption_costs
+        tax_multiplier = 1 + self._tax
+        return [
+            abs((entry.electricity_spot_prices * tax_multiplier + self._margin) * entry.electricity)
+            for entry in series
+            if entry.electricity is not None and entry.electricity_spot_prices is not None
+        ]
 
     def calculate_transfer_fees_between_dates(self, start_date: date, end_date: date):
         """Calculate your total transfer fee costs including the monthly base price
@@ -120,27 +166,18 @@ class HelenApiClient:
         ]
         if not valid_entries:
             return 0.0
-        hourly_weighted_consumption_prices = [
-            abs(entry.electricity_spot_prices * (1 + self._tax) * entry.electricity) for entry in valid_entries
-        ]
-        monthly_average_price = sum(
-            abs(entry.electricity_spot_prices * (1 + self._tax)) for entry in valid_entries
-        ) / len(valid_entries)
-        total_consumption = sum(abs(entry.electricity) for entry in valid_entries)
-        total_hourly_weighted_consumption_prices = sum(hourly_weighted_consumption_prices)
-        total_consumption_average_price = monthly_average_price * total_consumption
+        tax_multiplier = 1 + self._tax
+        hourly_prices = [abs(entry.electricity_spot_prices * tax_multiplier) for entry in valid_entries]
+        hourly_consumptions = [abs(entry.electricity) for entry in valid_entries]
+        return calculate_usage_impact(hourly_prices, hourly_consumptions)
 
-        impact = (total_hourly_weighted_consumption_prices - total_consumption_average_price) / total_consumption
-
-        return impact
-
-    @cachedmethod(lambda self: self._cache)
+    @_memo(ttl=3600)
     def get_daily_measurements_between_dates(self, start: date, end: date) -> MeasurementsWithSpotPriceResponse:
         """Get electricity measurements for each day between the given dates."""
 
         return self.get_measurements_with_spot_prices(start, end, resolution="day")
 
-    @cachedmethod(lambda self: self._cache)
+    @_memo(ttl=3600)
     def get_monthly_measurements_by_year(self, year: int) -> MeasurementsWithSpotPriceResponse:
         """Get electricity measurements for each month of the selected year."""
 
@@ -148,7 +185,7 @@ class HelenApiClient:
         end = date(year, 12, 31)
         return self.get_measurements_with_spot_prices(start, end, resolution="month")
 
-    @cachedmethod(lambda self: self._cache)
+    @_memo(ttl=3600)
     def get_measurements_between_dates(
         self, start: date, end: date, resolution: str = RESOLUTION_HOUR
     ) -> MeasurementsWithSpotPriceResponse:
@@ -156,7 +193,7 @@ class HelenApiClient:
 
         return self.get_measurements_with_spot_prices(start, end, resolution)
 
-    @cachedmethod(lambda self: self._cache)
+    @_memo(ttl=3600)
     def get_measurements_with_spot_prices(
         self, start: date, end: date, resolution: str = RESOLUTION_HOUR
     ) -> MeasurementsWithSpotPriceResponse:
@@ -184,7 +221,7 @@ class HelenApiClient:
 
         chart_url = f"{self.HELEN_API_URL_V28}/chart-data/{gsrn_id}/electricity"
         logger.debug("GET %s params=%s", chart_url, chart_params)
-        response = requests.get(
+        response = self._get_http_session().get(
             chart_url,
             params=chart_params,
             headers=self._api_request_headers(),
@@ -196,9 +233,9 @@ class HelenApiClient:
                 f"Helen chart-data request failed with status {response.status_code}: {response.text}"
             )
 
-        return MeasurementsWithSpotPriceResponse(**response.json())
+        return MeasurementsWithSpotPriceResponse(**orjson.loads(response.content))
 
-    @cachedmethod(lambda self: self._cache)
+    @_memo(ttl=3600)
     def get_spot_prices_from_chart_data(self, target_date: date) -> SpotPriceChartResponse:
         """Get electricity spot prices from chart data API for a single day. Returns data in 15-minute intervals.
 
@@ -212,30 +249,31 @@ class HelenApiClient:
 
         chart_params = {"start": start_time, "stop": end_time}
 
-        chart_url = self.HELEN_API_URL_V28 + self.SPOT_PRICES_CHART_ENDPOINT
+        chart_url = self.SPOT_PRICES_CHART_URL
         logger.debug("GET %s params=%s", chart_url, chart_params)
-        response = requests.get(
+        response = self._get_http_session().get(
             chart_url,
             params=chart_params,
             headers=self._api_request_headers(),
             timeout=HTTP_READ_TIMEOUT,
         )
 
-        return SpotPriceChartResponse(**response.json())
+        return SpotPriceChartResponse(**orjson.loads(response.content))
 
-    @cachedmethod(lambda self: self._cache)
+    @_memo(ttl=3600)
     def get_contract_data_json(self):
         """Get your contract data."""
 
-        contract_url = self.HELEN_API_URL_V28 + self.CONTRACT_ENDPOINT
+        contract_url = self.CONTRACT_URL
         contract_params = {"include_transfer": "true", "update": "true", "include_products": "true"}
         logger.debug("GET %s params=%s", contract_url, contract_params)
-        contract_response_dict = requests.get(
+        contract_response = self._get_http_session().get(
             contract_url,
             headers=self._api_request_headers(),
             timeout=HTTP_READ_TIMEOUT,
             params=contract_params,
-        ).json()
+        )
+        contract_response_dict = orjson.loads(contract_response.content)
         contracts_dict = contract_response_dict["contracts"]
 
         return contracts_dict
@@ -244,28 +282,29 @@ class HelenApiClient:
         """Get all delivery site ids from your contracts."""
 
         self._refresh_api_client_state()
-        delivery_sites = list(map(lambda contract: str(contract["delivery_site"]["id"]), self._all_active_contracts))
+        delivery_sites = [str(contract["delivery_site"]["id"]) for contract in self._all_active_contracts]
         return delivery_sites
 
     def get_all_gsrn_ids(self) -> list[int]:
         """Get all GSRN ids from your contracts."""
 
         self._refresh_api_client_state()
-        gsrn_ids = list(map(lambda contract: str(contract["gsrn"]), self._all_active_contracts))
+        gsrn_ids = [str(contract["gsrn"]) for contract in self._all_active_contracts]
         return gsrn_ids
 
     def select_delivery_site_if_valid_id(self, delivery_site_id: str = None):
         """Select a delivery site to be used when querying data."""
         delivery_sites = self.get_all_delivery_site_ids()
         gsrn_ids = self.get_all_gsrn_ids()
-        found_delivery_site_id = next(filter(lambda id: str(id) == delivery_site_id, delivery_sites), None)
+        found_delivery_site_id = next((site_id for site_id in delivery_sites if str(site_id) == delivery_site_id), None)
         if not found_delivery_site_id:
-            found_delivery_site_id = next(filter(lambda id: str(id) == delivery_site_id, gsrn_ids), None)
+            found_delivery_site_id = next((site_id for site_id in gsrn_ids if str(site_id) == delivery_site_id), None)
         if not found_delivery_site_id:
             raise InvalidDeliverySiteException(
                 f"Cannot select {delivery_site_id} because it does not exist in the active delivery sites list {delivery_sites} or GSRN id list {gsrn_ids}"
             )
         self._selected_delivery_site_id = str(found_delivery_site_id)
+        self._resolved_contracts = None
         self._refresh_api_client_state()
         self._invalidate_caches()
         logger.warning("Delivery site set to '%s'", delivery_site_id)
@@ -278,12 +317,12 @@ class HelenApiClient:
         if not contract:
             raise InvalidApiResponseException("Contract data is empty or None")
         products = contract["products"] if contract else []
-        product = next(filter(lambda p: p["product_type"] == "energy", products), None)
+        product = next((p for p in products if p["product_type"] == "energy"), None)
         if not product:
             logger.warning("Could not resolve contract base price from Helen API response. Returning 0.0")
             return 0.0
         components = product["components"] if product else []
-        base_price_component = next(filter(lambda component: component["is_base_price"], components), None)
+        base_price_component = next((c for c in components if c["is_base_price"]), None)
         if not base_price_component:
             logger.warning("Could not resolve contract base price from Helen API response. Returning 0.0")
             return 0.0
@@ -297,7 +336,7 @@ class HelenApiClient:
         if not contract:
             raise InvalidApiResponseException("Contract data is empty or None")
         products = contract["products"] if contract else []
-        product = next(filter(lambda p: p["product_type"] == "energy", products), None)
+        product = next((p for p in products if p["product_type"] == "energy"), None)
         if not product:
             logger.warning("Could not resolve contract type from Helen API response. Returning None")
             return None
@@ -332,14 +371,14 @@ class HelenApiClient:
         if not contract:
             raise InvalidApiResponseException("Contract data is empty or None")
         products = contract["products"] if contract else []
-        product = next(filter(lambda p: p["product_type"] == "energy", products), None)
+        product = next((p for p in products if p["product_type"] == "energy"), None)
         if not product:
             logger.warning("Could not resolve energy price from Helen API response. Returning 0.0")
             return 0.0
         if not product:
             raise InvalidApiResponseException("Product data is empty or None")
         components = product["components"] if product else []
-        energy_unit_price_component = next(filter(lambda component: component["name"] == "Energia", components), None)
+        energy_unit_price_component = next((c for c in components if c["name"] == "Energia"), None)
         if not energy_unit_price_component:
             logger.warning("Could not resolve energy price from Helen API response. Returning 0.0")
             return 0.0
@@ -353,12 +392,12 @@ class HelenApiClient:
         if not contract:
             raise InvalidApiResponseException("Contract data is empty or None")
         products = contract["products"] if contract else []
-        product = next(filter(lambda p: p["product_type"] == "transfer", products), None)
+        product = next((p for p in products if p["product_type"] == "transfer"), None)
         if not product:
             logger.warning("Could not resolve transfer fees from Helen API response. Returning 0.0")
             return 0.0
         components = product["components"] if product else []
-        transfer_fee_component = next(filter(lambda component: component["name"] == "Siirtomaksu", components), None)
+        transfer_fee_component = next((c for c in components if c["name"] == "Siirtomaksu"), None)
         if transfer_fee_component is None:
             logger.warning("Could not resolve transfer fees from Helen API response. Returning 0.0")
             return 0.0
@@ -372,12 +411,12 @@ class HelenApiClient:
         if not contract:
             raise InvalidApiResponseException("Contract data is empty or None")
         products = contract["products"] if contract else []
-        product = next(filter(lambda p: p["product_type"] == "transfer", products), None)
+        product = next((p for p in products if p["product_type"] == "transfer"), None)
         if not product:
             logger.warning("Could not resolve transfer base price from Helen API response. Returning 0.0")
             return 0.0
         components = product["components"] if product else []
-        transfer_base_price_component = next(filter(lambda component: component["is_base_price"], components), None)
+        transfer_base_price_component = next((c for c in components if c["is_base_price"]), None)
         if transfer_base_price_component is None:
             logger.warning("Could not resolve transfer base price from Helen API response. Returning 0.0")
             return 0.0
@@ -388,6 +427,9 @@ class HelenApiClient:
 
     def _refresh_api_client_state(self):
         contracts = self.get_contract_data_json()
+        if contracts is self._resolved_contracts:
+            # Same cached contract list as last time, so the selected contract is already resolved
+            return
         self._all_active_contracts = self._get_all_active_contracts(contracts)
 
         if self._selected_delivery_site_id is None:
@@ -397,15 +439,29 @@ class HelenApiClient:
         else:
             selected_active_contract = self._get_contract_by_delivery_site_id(self._all_active_contracts)
             self._selected_contract = selected_active_contract
+        self._resolved_contracts = contracts
+
+    def _get_http_session(self) -> requests.Session:
+        """Return the keep-alive HTTP session for the Oma Helen API, creating it on first use."""
+        if self._http is None:
+            self._http = requests.Session()
+            # All API versions live on the same host, so they share one pool of TLS connections
+            self._http.mount(self.HELEN_API_HOST, HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        return self._http
 
     def _invalidate_caches(self):
         self._cache.clear()
 
     def _api_request_headers(self):
-        return {
-            "Authorization": f"Bearer {self.get_api_access_token()}",
-            "Accept": "application/json",
-        }
+        """Return the API request headers, rebuilding them only when the access token changes."""
+        access_token = self.get_api_access_token()
+        if self._request_headers is None or self._request_headers[0] != access_token:
+            headers = {
+                "Authorization": f"Bearer {access_token}",
+                "Accept": "application/json",
+            }
+            self._request_headers = (access_token, headers)
+        return self._request_headers[1]
 
     def set_margin(self, margin: float):
         self._margin = margin
@@ -444,27 +500,20 @@ class HelenApiClient:
         """
         active_contracts = self._get_all_active_contracts(contracts)
         if self._selected_delivery_site_id:
-            if len(str(self._selected_delivery_site_id)) == 18:
-                active_contracts = list(
-                    filter(
-                        lambda contract: contract["gsrn"] == str(self._selected_delivery_site_id),
-                        active_contracts,
-                    )
-                )
+            selected_id = str(self._selected_delivery_site_id)
+            if len(selected_id) == 18:
+                active_contracts = [contract for contract in active_contracts if contract["gsrn"] == selected_id]
             else:
-                active_contracts = list(
-                    filter(
-                        lambda contract: str(contract["delivery_site"]["id"]) == str(self._selected_delivery_site_id),
-                        active_contracts,
-                    )
-                )
-        if active_contracts.__len__() > 1:
+                active_contracts = [
+                    contract for contract in active_contracts if str(contract["delivery_site"]["id"]) == selected_id
+                ]
+        if len(active_contracts) > 1:
             logger.debug("Found multiple active Helen contracts. Using the newest one.")
             active_contracts.sort(
                 key=lambda contract: datetime.strptime(contract["start_date"], '%Y-%m-%dT%H:%M:%S'),
                 reverse=True,
             )
-        if active_contracts.__len__() == 0:
+        if not active_contracts:
             logger.error("No active contracts found")
             return None
         return active_contracts[0]
@@ -473,7 +522,7 @@ class HelenApiClient:
         """
         Resolves the latest contract from a list of contracts.
         """
-        if contracts.__len__() == 0:
+        if not contracts:
             logger.error("No contracts found")
             return None
         contracts.sort(
@@ -503,13 +552,12 @@ class HelenApiClient:
         Returns:
             tuple of (start_time, stop_time) as ISO 8601 strings with UTC offset.
         """
-        fi_tz = ZoneInfo("Europe/Helsinki")
         # Midnight of start_date in Helsinki (= 21:00Z or 22:00Z of the previous UTC day)
-        local_start = datetime.combine(start_date, datetime.min.time()).replace(tzinfo=fi_tz)
+        local_start = datetime.combine(start_date, datetime.min.time(), tzinfo=_HELSINKI_TZ)
         # Midnight of the day after end_date in Helsinki (exclusive upper bound)
-        local_end = datetime.combine(end_date + timedelta(days=1), datetime.min.time()).replace(tzinfo=fi_tz)
+        local_end = datetime.combine(end_date + timedelta(days=1), datetime.min.time(), tzinfo=_HELSINKI_TZ)
 
-        utc_start = local_start.astimezone(ZoneInfo("UTC"))
-        utc_end = local_end.astimezone(ZoneInfo("UTC"))
+        utc_start = local_start.astimezone(timezone.utc)
+        utc_end = local_end.astimezone(timezone.utc)
 
         return (utc_start.isoformat(), utc_end.isoformat())
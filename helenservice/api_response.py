@@ -1,13 +1,29 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+# The response classes are dataclasses so that orjson serializes them natively through their __dict__.
+# The hand-written constructors are kept so that unknown API fields are still dropped via **_, which means
+# every attribute a constructor sets must also be declared as a field. eq=False keeps the default hash.
+@dataclass(init=False, eq=False)
 class SpotPriceChartSeries:
+    start: str
+    stop: str
+    electricity: Optional[float]
+    electricity_spot_prices_vat: Optional[float]
+    electricity_spot_prices: Optional[float]
+    electricity_spot_prices_hour_average_vat: Optional[float]
+    electricity_spot_prices_hour_average: Optional[float]
+
     def __init__(
         self,
         start: str,
         stop: str,
-        electricity: float = None,
-        electricity_spot_prices_vat: float = None,
-        electricity_spot_prices: float = None,
-        electricity_spot_prices_hour_average_vat: float = None,
-        electricity_spot_prices_hour_average: float = None,
+        electricity: Optional[float] = None,
+        electricity_spot_prices_vat: Optional[float] = None,
+        electricity_spot_prices: Optional[float] = None,
+        electricity_spot_prices_hour_average_vat: Optional[float] = None,
+        electricity_spot_prices_hour_average: Optional[float] = None,
         **_,
     ):
         self.start = start
@@ -19,7 +35,18 @@ class SpotPriceChartSeries:
         self.electricity_spot_prices_hour_average = electricity_spot_prices_hour_average
 
 
+@dataclass(init=False, eq=False)
 class SpotPriceChartResponse:
+    start: str
+    stop: str
+    resolution: str
+    units: dict
+    ids: dict
+    data_start_times: dict
+    data_stop_times: dict
+    series: list[SpotPriceChartSeries]
+    missing_series: list
+
     def __init__(
         self,
         start: str,
@@ -30,7 +57,7 @@ class SpotPriceChartResponse:
         data_start_times: dict,
         data_stop_times: dict,
         series: list,
-        missing_series: list = None,
+        missing_series: Optional[list] = None,
         **_,
     ):
         self.start = start
@@ -40,21 +67,30 @@ class SpotPriceChartResponse:
         self.ids = ids
         self.data_start_times = data_start_times
         self.data_stop_times = data_stop_times
-        self.series = list(map(lambda s: SpotPriceChartSeries(**s), series))
+        self.series = [SpotPriceChartSeries(**s) for s in series]
         self.missing_series = missing_series if missing_series is not None else []
 
 
+@dataclass(init=False, eq=False)
 class MeasurementsWithSpotPriceSeries:
+    start: str
+    stop: str
+    electricity: Optional[float]
+    electricity_spot_prices_vat: Optional[float]
+    electricity_spot_prices: Optional[float]
+    ambient_temperature: Optional[float]
+    ambient_humidity: Optional[float]
+
     def __init__(
         self,
         start: str,
         stop: str,
-        electricity: float = None,
-        electricity_transfer: float = None,
-        electricity_spot_prices_vat: float = None,
-        electricity_spot_prices: float = None,
-        ambient_temperature: float = None,
-        ambient_humidity: float = None,
+        electricity: Optional[float] = None,
+        electricity_transfer: Optional[float] = None,
+        electricity_spot_prices_vat: Optional[float] = None,
+        electricity_spot_prices: Optional[float] = None,
+        ambient_temperature: Optional[float] = None,
+        ambient_humidity: Optional[float] = None,
         **_,
     ):
         self.start = start
@@ -66,7 +102,18 @@ class MeasurementsWithSpotPriceSeries:
         self.ambient_humidity = ambient_humidity
 
 
+@dataclass(init=False, eq=False)
 class MeasurementsWithSpotPriceResponse:
+    start: str
+    stop: str
+    resolution: str
+    units: dict
+    ids: dict
+    data_start_times: dict
+    data_stop_times: dict
+    series: list[MeasurementsWithSpotPriceSeries]
+    missing_series: list
+
     def __init__(
         self,
         start: str,
@@ -77,7 +124,7 @@ class MeasurementsWithSpotPriceResponse:
         data_start_times: dict,
         data_stop_times: dict,
         series: list,
-        missing_series: list = None,
+        missing_series: Optional[list] = None,
         **_,
     ):
         self.start = start
@@ -87,5 +134,5 @@ class MeasurementsWithSpotPriceResponse:
         self.ids = ids
         self.data_start_times = data_start_times
         self.data_stop_times = data_stop_times
-        self.series = list(map(lambda s: MeasurementsWithSpotPriceSeries(**s), series))
+        self.series = [MeasurementsWithSpotPriceSeries(**s) for s in series]
         self.missing_series = missing_series if missing_series is not None else []
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
-import json
 import logging
 import os
 import sys
 from cmd import Cmd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
 from getpass import getpass
 from typing import Any, Protocol, overload
 
+import orjson
+
 from helenservice.api_exceptions import (
     HelenAuthenticationException,
     InvalidApiResponseException,
@@ -22,6 +24,9 @@ from .utils import get_month_date_range_by_date
 
 logger = logging.getLogger(__name__)
 
+# Pass dates and datetimes through to _json_serializer to keep their established output format
+_JSON_DUMPS_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME
+
 
 class HasDict(Protocol):
     """Protocol defining objects that possess a __dict__ attribute."""
@@ -46,6 +51,11 @@ def _json_serializer(value: datetime | date | HasDict) -> str | dict[str, Any]:
         return value.__dict__
 
 
+def _dumps_json(value: Any) -> str:
+    """Serialize a value to pretty-printed JSON for CLI output."""
+    return orjson.dumps(value, default=_json_serializer, option=_JSON_DUMPS_OPTIONS).decode()
+
+
 def _parse_date_range(input_str: str | None) -> tuple[date, date]:
     """Parse and validate a date range string in format 'YYYY-mm-dd YYYY-mm-dd'.
 
@@ -81,9 +91,18 @@ class HelenCLIPrompt(Cmd):
         self._password = password
         self.helen_price_client = HelenPriceClient()
         self.tax: float = 0.255  # 25.5%
-        self.margin: float = self.helen_price_client.get_exchange_prices().margin
-        self.api_client = HelenApiClient(self.tax, self.margin)
-        self.api_client.login_and_init(username, password)
+        # Scraping the margin from helen.fi does not depend on the login, so run both round-trips concurrently
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            exchange_prices_future = executor.submit(self.helen_price_client.get_exchange_prices)
+            self.api_client = HelenApiClient(self.tax)
+            self.api_client.login_and_init(username, password)
+            try:
+                self.margin: float = exchange_prices_future.result().margin
+            except Exception:
+                # Release the logged-in session and pooled connections instead of leaking them
+                self.api_client.close()
+                raise
+        self.api_client.set_margin(self.margin)
 
     def onecmd(self, line: str) -> bool:
         try:
@@ -178,7 +197,7 @@ class HelenCLIPrompt(Cmd):
 
         year = date.today().year
         monthly_measurements = self.api_client.get_monthly_measurements_by_year(year)
-        monthly_measurements_json = json.dumps(monthly_measurements, default=_json_serializer, indent=2)
+        monthly_measurements_json = _dumps_json(monthly_measurements)
         print(monthly_measurements_json)
 
     def do_get_daily_measurements_json(self, arg: str | None = None) -> None:
@@ -189,28 +208,28 @@ class HelenCLIPrompt(Cmd):
         daily_measurements = self.api_client.get_daily_measurements_between_dates(
             previous_month_last_day_date, wanted_month_last_day_date
         )
-        daily_measurements_json = json.dumps(daily_measurements, default=_json_serializer, indent=2)
+        daily_measurements_json = _dumps_json(daily_measurements)
         print(daily_measurements_json)
 
     def do_get_contract_data_json(self, arg: str | None = None) -> None:
         """Get all your contracts as JSON (includes terminated contracts)"""
 
         contract_data_json = self.api_client.get_contract_data_json()
-        contract_data_json_pretty = json.dumps(contract_data_json, default=_json_serializer, indent=2)
+        contract_data_json_pretty = _dumps_json(contract_data_json)
         print(contract_data_json_pretty)
 
     def do_get_market_prices_json(self, arg: str | None = None) -> None:
         """Get prices for the Market Price contract type as JSON"""
 
         price = self.helen_price_client.get_market_price_prices()
-        price_json = json.dumps(price, default=_json_serializer, indent=2)
+        price_json = _dumps_json(price)
         print(price_json)
 
     def do_get_exchange_margin_price_json(self, arg: str | None = None) -> None:
         """Get margin price for the Exchange Electricity contract type as JSON"""
 
         price = self.helen_price_client.get_exchange_prices()
-        price_json = json.dumps(price, default=_json_serializer, indent=2)
+        price_json = _dumps_json(price)
         print(price_json)
 
     def do_get_contract_base_price(self, arg: str | None = None) -> None:
@@ -310,7 +329,7 @@ class HelenCLIPrompt(Cmd):
             try:
                 target_date = datetime.strptime(str(arg).strip(), '%Y-%m-%d').date()
                 spot_prices = self.api_client.get_spot_prices_from_chart_data(target_date)
-                spot_prices_json = json.dumps(spot_prices, default=_json_serializer, indent=2)
+                spot_prices_json = _dumps_json(spot_prices)
                 print(spot_prices_json)
             except ValueError:
                 print("Please provide a valid date in format 'YYYY-mm-dd'")
@@ -327,7 +346,7 @@ class HelenCLIPrompt(Cmd):
             measurements_with_spot_prices = self.api_client.get_measurements_with_spot_prices(
                 start_date, end_date, RESOLUTION_HOUR
             )
-            measurements_json = json.dumps(measurements_with_spot_prices, default=_json_serializer, indent=2)
+            measurements_json = _dumps_json(measurements_with_spot_prices)
             print(measurements_json)
         except ValueError:
             print("Please provide proper start and end dates in format 'YYYY-mm-dd'")
@@ -344,7 +363,7 @@ class HelenCLIPrompt(Cmd):
             measurements_with_spot_prices = self.api_client.get_measurements_with_spot_prices(
                 start_date, end_date, RESOLUTION_QUARTER
             )
-            measurements_json = json.dumps(measurements_with_spot_prices, default=_json_serializer, indent=2)
+            measurements_json = _dumps_json(measurements_with_spot_prices)
             print(measurements_json)
         except ValueError:
             print("Please provide proper start and end dates in format 'YYYY-mm-dd'")
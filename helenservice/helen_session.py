@@ -21,6 +21,7 @@ class HelenSession:
 
     def __init__(self) -> None:
         self._session: Session | None = None
+        self._token_expiry: tuple[str, float] | None = None
 
     def login(self, username: str, password: str) -> HelenSession:
         """Login to Oma Helen and extract the access-token cookie."""
@@ -53,11 +54,17 @@ class HelenSession:
         if not token:
             return False
         try:
-            payload = json.loads(base64.urlsafe_b64decode(token.split(".")[1] + "=="))
-            return payload["exp"] > time.time()
+            return self._get_token_expiry(token) > time.time()
         except Exception:
             return False
 
+    def _get_token_expiry(self, token: str) -> float:
+        """Return the exp claim of the access-token JWT, decoding it only when the token has changed."""
+        if self._token_expiry is None or self._token_expiry[0] != token:
+            payload = json.loads(base64.urlsafe_b64decode(token.split(".")[1] + "=="))
+            self._token_expiry = (token, payload["exp"])
+        return self._token_expiry[1]
+
     def get_all_cookies(self) -> list[tuple[str, str, str, str]]:
         """Return all session cookies as (name, value, domain, path) tuples."""
         if self._session is None:
@@ -1,6 +1,7 @@
 import logging
 from datetime import date, datetime, timedelta
 
+import orjson
 from bs4 import BeautifulSoup
 from requests import get
 
@@ -19,7 +20,7 @@ class VattenfallPriceClient:
         logger.debug("GET %s", url)
         response = get(url, headers=self.HEADERS)
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
         else:
             logger.warning("Could not fetch prices. Response code was: %s", response.status_code)
 
@@ -28,7 +29,7 @@ class VattenfallPriceClient:
         logger.debug("GET %s", url)
         response = get(url, headers=self.HEADERS)
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
         else:
             logger.warning("Could not fetch prices. Response code was: %s", response.status_code)
 
@@ -1,4 +1,5 @@
 import calendar
+import operator
 from datetime import date
 
 
@@ -12,3 +13,18 @@ def get_month_date_range_by_date(date_param: date) -> tuple[date, date]:
     )
 
     return wanted_month_first_day, wanted_month_last_day
+
+
+def calculate_usage_impact(hourly_prices: list[float], hourly_consumptions: list[float]) -> float:
+    """
+    Calculate the price impact (c/kWh) of usage with formula (A-B) / E from non-negative hourly prices
+    and consumptions of equal length, where A is the consumption-weighted price sum, B the total consumption
+    multiplied with the average price and E the total consumption.
+    """
+    # Dot product of prices and consumptions; map(operator.mul) keeps the per-hour loop in C
+    total_hourly_weighted_consumption_prices = sum(map(operator.mul, hourly_prices, hourly_consumptions))
+    average_price = sum(hourly_prices) / len(hourly_prices)
+    total_consumption = sum(hourly_consumptions)
+    total_consumption_average_price = average_price * total_consumption
+
+    return (total_hourly_weighted_consumption_prices - total_consumption_average_price) / total_consumption
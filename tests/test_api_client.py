@@ -32,7 +32,8 @@ class TestHelenApiClient:
         return api_client
 
     def test_get_daily_measurements_between_dates(self, api_client):
-        with patch("requests.get", return_value=self._mock_response(self._load("measurement_spot_day_response.json"))) as mock_get:
+        response = self._mock_response(self._load("measurement_spot_day_response.json"))
+        with patch("requests.Session.get", return_value=response) as mock_get:
             result = api_client.get_daily_measurements_between_dates(date(2025, 9, 7), date(2025, 10, 8))
 
         self._assert_v28_chart_data_call(mock_get, resolution="day")
@@ -41,7 +42,8 @@ class TestHelenApiClient:
         assert len(result.series) > 0
 
     def test_get_measurements_between_dates_hourly(self, api_client):
-        with patch("requests.get", return_value=self._mock_response(self._load("measurement_spot_hour_response.json"))) as mock_get:
+        response = self._mock_response(self._load("measurement_spot_hour_response.json"))
+        with patch("requests.Session.get", return_value=response) as mock_get:
             result = api_client.get_measurements_between_dates(date(2025, 9, 7), date(2025, 9, 8), RESOLUTION_HOUR)
 
         self._assert_v28_chart_data_call(mock_get, resolution="hour")
@@ -50,14 +52,16 @@ class TestHelenApiClient:
         assert len(result.series) > 0
 
     def test_get_monthly_measurements_by_year(self, api_client):
-        with patch("requests.get", return_value=self._mock_response(self._load("measurement_spot_day_response.json"))) as mock_get:
+        response = self._mock_response(self._load("measurement_spot_day_response.json"))
+        with patch("requests.Session.get", return_value=response) as mock_get:
             result = api_client.get_monthly_measurements_by_year(2025)
 
         self._assert_v28_chart_data_call(mock_get, resolution="month")
         assert isinstance(result, MeasurementsWithSpotPriceResponse)
 
     def test_get_spot_prices_from_chart_data(self, api_client):
-        with patch("requests.get", return_value=self._mock_response(self._load("chart_data_response.json"))) as mock_get:
+        response = self._mock_response(self._load("chart_data_response.json"))
+        with patch("requests.Session.get", return_value=response) as mock_get:
             result = api_client.get_spot_prices_from_chart_data(date(2025, 10, 6))
 
         mock_get.assert_called_once()
@@ -68,7 +72,8 @@ class TestHelenApiClient:
         assert len(result.series) > 0
 
     def test_get_contract_data_json(self, api_client):
-        with patch("requests.get", return_value=self._mock_response(self._load("contracts_response.json"))) as mock_get:
+        response = self._mock_response(self._load("contracts_response.json"))
+        with patch("requests.Session.get", return_value=response) as mock_get:
             result = api_client.get_contract_data_json()
 
         params = mock_get.call_args.kwargs["params"]
@@ -115,6 +120,42 @@ class TestHelenApiClient:
             with pytest.raises(InvalidApiResponseException, match="Contract data is empty or None"):
                 api_client.get_contract_start_date()
 
+    def test_refresh_api_client_state_reuses_resolved_contracts(self, api_client):
+        contracts = [self._contract("643007572123456789", 1111111), self._contract("643007572987654321", 2222222)]
+        with patch.object(api_client, "get_contract_data_json", return_value=contracts), patch.object(
+            api_client, "_get_all_active_contracts", wraps=api_client._get_all_active_contracts
+        ) as mock_get_active:
+            api_client._refresh_api_client_state()
+            call_count = mock_get_active.call_count
+            api_client._refresh_api_client_state()
+
+        assert call_count > 0
+        assert mock_get_active.call_count == call_count
+
+    def test_select_delivery_site_resolves_contract_again(self, api_client):
+        contracts = [self._contract("643007572123456789", 1111111), self._contract("643007572987654321", 2222222)]
+        api_client._selected_delivery_site_id = None
+        with patch.object(api_client, "get_contract_data_json", return_value=contracts):
+            api_client._refresh_api_client_state()
+            selected_gsrn = api_client._selected_contract["gsrn"]
+            other_gsrn = next(gsrn for gsrn in api_client.get_all_gsrn_ids() if gsrn != selected_gsrn)
+            api_client.select_delivery_site_if_valid_id(other_gsrn)
+
+        assert api_client._selected_contract["gsrn"] == other_gsrn
+
+    @pytest.mark.parametrize(
+        "components,expected",
+        [
+            ([{"name": "Energia", "is_base_price": False, "price": 9.5}, {"is_base_price": True, "price": 4.9}], 4.9),
+            ([{"name": "Energia", "is_base_price": False, "price": 9.5}], 0.0),
+        ],
+        ids=["base_price_found", "base_price_missing"],
+    )
+    def test_get_contract_base_price(self, api_client, components, expected):
+        api_client._selected_contract = {"products": [{"product_type": "energy", "components": components}]}
+        with patch.object(api_client, "_refresh_api_client_state"):
+            assert api_client.get_contract_base_price() == expected
+
     @pytest.mark.parametrize(
         "resolution,resource,expect_ambient",
         [
@@ -123,7 +164,7 @@ class TestHelenApiClient:
         ],
     )
     def test_get_measurements_with_spot_prices(self, api_client, resolution, resource, expect_ambient):
-        with patch("requests.get", return_value=self._mock_response(self._load(resource))) as mock_get:
+        with patch("requests.Session.get", return_value=self._mock_response(self._load(resource))) as mock_get:
             result = api_client.get_measurements_with_spot_prices(date(2025, 10, 6), date(2025, 10, 7), resolution)
 
         self._assert_v28_chart_data_call(mock_get, resolution=resolution)
@@ -164,7 +205,7 @@ class TestHelenApiClient:
         ``no-relevant-contract`` (403) for transfer-only delivery sites.
         """
         response = self._mock_response(json_body=body, ok=False, status_code=status_code)
-        with patch("requests.get", return_value=response):
+        with patch("requests.Session.get", return_value=response):
             with pytest.raises(InvalidApiResponseException) as exc_info:
                 api_client.get_measurements_with_spot_prices(date(2025, 10, 1), date(2025, 10, 8), "day")
 
@@ -176,7 +217,7 @@ class TestHelenApiClient:
         """The wrapper must surface the same exception raised by the underlying call,
         not a TypeError from response parsing."""
         response = self._mock_response(json_body={}, ok=False, status_code=500, text="Internal Server Error")
-        with patch("requests.get", return_value=response):
+        with patch("requests.Session.get", return_value=response):
             with pytest.raises(InvalidApiResponseException):
                 api_client.get_daily_measurements_between_dates(date(2025, 10, 1), date(2025, 10, 8))
 
@@ -186,7 +227,7 @@ class TestHelenApiClient:
         and the ``electricity_transfer`` field is exposed as the unified
         ``electricity`` value."""
         body = self._load("measurement_transfer_day_response.json")
-        with patch("requests.get", return_value=self._mock_response(body)) as mock_get:
+        with patch("requests.Session.get", return_value=self._mock_response(body)) as mock_get:
             result = api_client_transfer.get_daily_measurements_between_dates(date(2025, 10, 1), date(2025, 10, 4))
 
         self._assert_v28_chart_data_call(mock_get, resolution="day", channel="osv")
@@ -198,12 +239,84 @@ class TestHelenApiClient:
         """get_total_consumption_between_dates must sum the transfer kWh,
         ignoring null entries, when only an electricity-transfer contract exists."""
         body = self._load("measurement_transfer_day_response.json")
-        with patch("requests.get", return_value=self._mock_response(body)):
+        with patch("requests.Session.get", return_value=self._mock_response(body)):
             total = api_client_transfer.get_total_consumption_between_dates(date(2025, 10, 1), date(2025, 10, 4))
 
         # Sum of non-null electricity_transfer values from the fixture (10 + 20 + 30)
         assert total == pytest.approx(60.0)
 
+    def test_calculate_impact_of_usage_between_dates(self, api_client):
+        body = self._load("measurement_spot_hour_response.json")
+        with patch("requests.Session.get", return_value=self._mock_response(body)):
+            impact = api_client.calculate_impact_of_usage_between_dates(date(2025, 10, 6), date(2025, 10, 7))
+
+        entries = [
+            s
+            for s in body["series"]
+            if s.get("electricity") is not None and s.get("electricity_spot_prices") is not None
+        ]
+        prices = [abs(s["electricity_spot_prices"] * (1 + api_client._tax)) for s in entries]
+        consumptions = [abs(s["electricity"]) for s in entries]
+        weighted = sum(p * c for p, c in zip(prices, consumptions))
+        expected = (weighted - sum(prices) / len(prices) * sum(consumptions)) / sum(consumptions)
+        assert impact == pytest.approx(expected)
+
+    def test_calculate_total_costs_by_spot_prices_between_dates(self, api_client):
+        body = self._load("measurement_spot_hour_response.json")
+        with patch("requests.Session.get", return_value=self._mock_response(body)):
+            total = api_client.calculate_total_costs_by_spot_prices_between_dates(date(2025, 10, 6), date(2025, 10, 7))
+
+        expected = sum(
+            abs((s["electricity_spot_prices"] * (1 + api_client._tax) + api_client._margin) * s["electricity"])
+            for s in body["series"]
+            if s.get("electricity") is not None and s.get("electricity_spot_prices") is not None
+        )
+        assert total == pytest.approx(expected / 100)
+
+    @pytest.mark.parametrize(
+        "start,end,expected",
+        [
+            (date(2025, 1, 1), date(2025, 1, 31), ("2024-12-31T22:00:00+00:00", "2025-01-31T22:00:00+00:00")),
+            (date(2025, 3, 29), date(2025, 3, 30), ("2025-03-28T22:00:00+00:00", "2025-03-30T21:00:00+00:00")),
+            (date(2025, 10, 25), date(2025, 10, 26), ("2025-10-24T21:00:00+00:00", "2025-10-26T22:00:00+00:00")),
+        ],
+        ids=["winter", "dst_start", "dst_end"],
+    )
+    def test_get_utc_time_range(self, api_client, start, end, expected):
+        assert api_client._get_utc_time_range(start, end) == expected
+
+    def test_cached_methods_do_not_share_entries(self, api_client):
+        """Methods sharing the instance cache must not return each other's results for equal arguments."""
+        daily = self._load("measurement_spot_day_response.json")
+        hourly = self._load("measurement_spot_hour_response.json")
+        responses = [self._mock_response(daily), self._mock_response(hourly)]
+        with patch("requests.Session.get", side_effect=responses) as mock_get:
+            daily_result = api_client.get_daily_measurements_between_dates(date(2025, 10, 6), date(2025, 10, 7))
+            hourly_result = api_client.get_measurements_between_dates(date(2025, 10, 6), date(2025, 10, 7))
+
+        assert mock_get.call_count == 2
+        assert daily_result.resolution == "day"
+        assert hourly_result.resolution == "hour"
+
+    def test_cached_results_expire_after_ttl(self, api_client):
+        response = self._mock_response(self._load("contracts_response.json"))
+        with patch("requests.Session.get", return_value=response) as mock_get, patch(
+            "helenservice.api_client.time.monotonic", side_effect=[0.0, 3599.0, 3600.0]
+        ):
+            api_client.get_contract_data_json()
+            api_client.get_contract_data_json()
+            assert mock_get.call_count == 1
+            api_client.get_contract_data_json()
+            assert mock_get.call_count == 2
+
+    def test_api_request_headers_are_rebuilt_on_token_change(self, api_client):
+        headers = api_client._api_request_headers()
+        assert headers["Authorization"] == "Bearer mock_token"
+        assert api_client._api_request_headers() is headers
+
+        api_client._session.get_access_token.return_value = "new_token"
+        assert api_client._api_request_headers()["Authorization"] == "Bearer new_token"
+
     def test_close_saves_cookies_and_nulls_session(self, api_client):
         api_client._session.get_all_cookies.return_value = [("access-token", "tok", ".oma.helen.fi", "/")]
         api_client.close()
@@ -217,6 +330,23 @@ class TestHelenApiClient:
         api_client.close()   # session is None — must be a no-op
         assert api_client._saved_cookies == [("access-token", "tok", ".oma.helen.fi", "/")]
 
+    def test_api_calls_reuse_http_session(self, api_client):
+        with patch("requests.Session.get", return_value=self._mock_response(self._load("contracts_response.json"))):
+            api_client.get_contract_data_json()
+            http_session = api_client._http
+            api_client._invalidate_caches()
+            api_client.get_contract_data_json()
+
+        assert http_session is not None
+        assert api_client._http is http_session
+
+    def test_close_closes_http_session(self, api_client):
+        http_session = Mock()
+        api_client._http = http_session
+        api_client.close()
+        http_session.close.assert_called_once()
+        assert api_client._http is None
+
     # ------------------------------------------------------------------
     # Test helpers
     # ------------------------------------------------------------------
@@ -226,13 +356,23 @@ class TestHelenApiClient:
         with open(f"tests/resources/{name}") as f:
             return json.load(f)
 
+    @staticmethod
+    def _contract(gsrn, delivery_site_id):
+        return {
+            "gsrn": gsrn,
+            "delivery_site": {"id": delivery_site_id},
+            "start_date": "2020-11-05T00:00:00",
+            "end_date": None,
+            "domain": "electricity",
+        }
+
     @staticmethod
     def _mock_response(json_body=None, ok=True, status_code=200, text=""):
         response = Mock()
         response.ok = ok
         response.status_code = status_code
         response.text = text or (json.dumps(json_body) if json_body is not None else "")
-        response.json.return_value = json_body if json_body is not None else {}
+        response.content = json.dumps(json_body if json_body is not None else {}).encode()
         return response
 
     @staticmethod
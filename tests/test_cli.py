@@ -0,0 +1,31 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from helenservice.api_client import HelenApiClient
+from helenservice.cli import HelenCLIPrompt
+from helenservice.price_client import HelenPriceClient
+
+
+class TestHelenCLIPromptInit:
+    def test_applies_scraped_margin_after_login(self):
+        with patch.object(HelenPriceClient, "get_exchange_prices", return_value=Mock(margin=0.49)), patch.object(
+            HelenApiClient, "login_and_init"
+        ) as mock_login:
+            prompt = HelenCLIPrompt("user", "secret")
+
+        mock_login.assert_called_once_with("user", "secret")
+        assert prompt.margin == 0.49
+        assert prompt.api_client._margin == 0.49
+
+    def test_closes_logged_in_client_when_margin_scrape_fails(self):
+        with patch.object(
+            HelenPriceClient, "get_exchange_prices", side_effect=ConnectionError("helen.fi down")
+        ), patch.object(HelenApiClient, "login_and_init") as mock_login, patch.object(
+            HelenApiClient, "close"
+        ) as mock_close:
+            with pytest.raises(ConnectionError, match="helen.fi down"):
+                HelenCLIPrompt("user", "secret")
+
+        mock_login.assert_called_once_with("user", "secret")
+        mock_close.assert_called_once()
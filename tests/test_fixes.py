@@ -1,7 +1,12 @@
+import dataclasses
 import json
 from datetime import date, datetime
+from unittest.mock import patch
 
-from helenservice.cli import _json_serializer
+import pytest
+
+from helenservice.api_response import MeasurementsWithSpotPriceResponse, SpotPriceChartResponse
+from helenservice.cli import _dumps_json, _json_serializer
 
 
 def test_json_serializer_date():
@@ -21,3 +26,53 @@ def test_json_serializer_object():
             self.foo = "bar"
 
     assert _json_serializer(TestObj()) == {"foo": "bar"}
+
+
+def test_dumps_json_keeps_serializer_formats():
+    class TestObj:
+        def __init__(self):
+            self.day = date(2024, 5, 8)
+            self.timestamp = datetime(2024, 5, 8, 12, 34, 56)
+
+    assert json.loads(_dumps_json(TestObj())) == {"day": "2024-05-08", "timestamp": "20240508123456"}
+
+
+def test_dumps_json_serializes_responses_without_default_callback():
+    with open("tests/resources/measurement_spot_hour_response.json") as f:
+        body = json.load(f)
+    response = MeasurementsWithSpotPriceResponse(**body)
+
+    with patch("helenservice.cli._json_serializer", side_effect=AssertionError("default called")):
+        dumped = json.loads(_dumps_json(response))
+
+    assert dumped["resolution"] == body["resolution"]
+    assert dumped["series"][0]["start"] == body["series"][0]["start"]
+
+
+def test_dumps_json_outputs_non_ascii_unescaped():
+    with open("tests/resources/measurement_spot_hour_response.json", encoding="utf-8") as f:
+        response = MeasurementsWithSpotPriceResponse(**json.load(f))
+
+    dumped = _dumps_json(response)
+
+    assert '"ambient_temperature": "°C"' in dumped
+    assert "\\u00b0" not in dumped
+
+
+@pytest.mark.parametrize(
+    ("response_class", "fixture"),
+    [
+        (MeasurementsWithSpotPriceResponse, "measurement_spot_hour_response.json"),
+        (MeasurementsWithSpotPriceResponse, "measurement_transfer_day_response.json"),
+        (SpotPriceChartResponse, "chart_data_response.json"),
+    ],
+)
+def test_response_attributes_match_dataclass_fields(response_class, fixture):
+    # orjson serializes the responses through __dict__, so an attribute missing from the field list
+    # would still be output while dataclasses.asdict() and repr() would silently drop it
+    with open(f"tests/resources/{fixture}") as f:
+        response = response_class(**json.load(f))
+
+    for obj in (response, response.series[0]):
+        assert set(vars(obj)) == {field.name for field in dataclasses.fields(obj)}
+        assert hash(obj) == hash(obj)
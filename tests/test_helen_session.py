@@ -181,6 +181,19 @@ class TestIsTokenValid:
         session._session.cookies.get.return_value = "not.a.jwt"
         assert session.is_token_valid() is False
 
+    def test_decodes_token_only_when_it_changes(self):
+        session = HelenSession()
+        session._session = MagicMock()
+        session._session.cookies.get.return_value = _make_jwt(int(time.time()) + 3600)
+        with patch("helenservice.helen_session.base64.urlsafe_b64decode", wraps=base64.urlsafe_b64decode) as decode:
+            assert session.is_token_valid() is True
+            assert session.is_token_valid() is True
+            assert decode.call_count == 1
+
+            session._session.cookies.get.return_value = _make_jwt(int(time.time()) - 1)
+            assert session.is_token_valid() is False
+            assert decode.call_count == 2
+
 
 class TestGetAllCookies:
     def test_returns_empty_when_no_session(self):
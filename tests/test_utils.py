@@ -0,0 +1,12 @@
+import pytest
+
+from helenservice.utils import calculate_usage_impact
+
+
+def test_calculate_usage_impact_is_zero_for_flat_prices():
+    assert calculate_usage_impact([10.0, 10.0, 10.0], [1.0, 2.0, 3.0]) == pytest.approx(0.0)
+
+
+def test_calculate_usage_impact_weights_prices_by_consumption():
+    # A = 5*3 + 15*1 = 30, B = 10 * 4 = 40, E = 4
+    assert calculate_usage_impact([5.0, 15.0], [3.0, 1.0]) == pytest.approx(-2.5)